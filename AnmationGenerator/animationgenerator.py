@@ -3,7 +3,8 @@ from openai import OpenAI
 from gtts import gTTS
 from mutagen.mp3 import MP3
 import cv2
-import subprocess, re, ast, os, sys
+import subprocess, re, ast, os, sys, csv, json, time, argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from playsound import playsound   # <<< ADDED
 import threading                  # <<< ADDED
 
@@ -116,6 +117,16 @@ def render_video_with_audio(script, audio_file, preview=False):
         subprocess.Popen(f"manim -ql {script} AutoTeach", shell=True)
 
 
+def render_video(script):
+    # Batch mode → blocking render, returns the exact file manim -ql writes
+    video = os.path.join("media", "videos", os.path.splitext(script)[0], "480p15", "AutoTeach.mp4")
+    if os.path.exists(video):
+        os.remove(video)
+    if subprocess.run(f"manim -ql {script} AutoTeach", shell=True).returncode != 0 or not os.path.exists(video):
+        raise Exception(f"Manim render failed for {script}")
+    return video
+
+
 def find_video_for_topic(script_name):
     folder = os.path.splitext(script_name)[0]
     base = os.path.join("media", "videos", folder)
@@ -151,22 +162,22 @@ def get_video_duration(p):
 # ===========================
 # ⭐ NEW: STRETCH VIDEO TO MATCH AUDIO
 # ===========================
-def stretch_video_to_audio(video, audio_len):
+def stretch_video_to_audio(video, audio_len, stretched=None):
     video_len = get_video_duration(video)
     if video_len == 0 or video_len >= audio_len:
         return video
 
     speed_factor = video_len / audio_len
-    stretched = video.replace(".mp4", "_stretched.mp4")
+    stretched = stretched or video.replace(".mp4", "_stretched.mp4")
 
     cmd = (
         f'ffmpeg -y -i "{video}" -filter:v "setpts=(1/{speed_factor})*PTS" '
         f'-c:v libx264 -pix_fmt yuv420p "{stretched}"'
     )
 
-    subprocess.run(cmd, shell=True)
+    ok = subprocess.run(cmd, shell=True).returncode == 0
 
-    return stretched if os.path.exists(stretched) else video
+    return stretched if ok and os.path.exists(stretched) else video
 
 # ===========================
 # 🔊 MERGE AUDIO + VIDEO
@@ -176,8 +187,8 @@ def merge_audio_video(video, audio, output):
         f'ffmpeg -y -i "{video}" -i "{audio}" '
         f'-c:v copy -c:a aac -map 0:v -map 1:a -shortest "{output}"'
     )
-    subprocess.run(cmd, shell=True)
-    return os.path.exists(output)
+    ok = subprocess.run(cmd, shell=True).returncode == 0
+    return ok and os.path.exists(output)
 
 # ===========================
 # 📝 QUIZ
@@ -247,11 +258,212 @@ def generate_content(topic, lang_key):
     return summary, final_video.replace("\\", "/"), quiz
 
 
+# =========================================================
+# 📦 BATCH PRE-RENDERING
+# =========================================================
+# Manifest: one topic per row, followed by the languages to render it in
+# (menu number, code or name, e.g. "Photosynthesis,kn,hi"). A row with only
+# a topic renders every language. Blank rows and rows starting with # are skipped.
+#
+# Per topic, one Manim video is rendered and shared by every language; per
+# (topic, language) the summary/quiz, narration and final mux are produced.
+# Finished jobs are appended to a ledger so a crashed run can be resumed.
+
+def topic_slug(topic):
+    return re.sub(r"[^A-Za-z0-9_]", "_", topic)
+
+def resolve_language(name):
+    name = name.strip().lower()
+    for key, entry in LANG_MAP.items():
+        if name in (key, entry[0].lower(), entry[1]):
+            return key
+    raise ValueError(f"Unknown language: {name!r}")
+
+def load_manifest(path):
+    jobs, seen_slugs = {}, {}
+    with open(path, encoding="utf-8-sig") as f:
+        for row in csv.reader(f):
+            row = [c.strip() for c in row if c.strip()]
+            if not row or row[0].startswith("#"):
+                continue
+            topic = row[0]
+            slug = topic_slug(topic)
+            if seen_slugs.setdefault(slug, topic) != topic:
+                raise ValueError(f"Topics {seen_slugs[slug]!r} and {topic!r} share the file name {slug!r}")
+            keys = [resolve_language(l) for l in row[1:]] or list(LANG_MAP)
+            langs = jobs.setdefault(topic, [])
+            langs.extend(k for k in keys if k not in langs)
+    return jobs
+
+def load_ledger(path):
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            # Drop the half-written line from a crash so the next append starts on a fresh line
+            f.truncate(data.rfind(b"\n") + 1)
+    for line in data.decode("utf-8", "replace").splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        done[entry["job"]] = entry["result"]
+    return done
+
+def record_ledger(ledger, job, result):
+    ledger.write(json.dumps({"job": job, "result": result}, ensure_ascii=False) + "\n")
+    ledger.flush()
+    os.fsync(ledger.fileno())
+
+def outputs_exist(result):
+    return all(os.path.exists(p) for k, p in result.items() if k.endswith("_file"))
+
+# ---- Pool workers: each returns (result, {stage: seconds}) ----
+
+def batch_video_job(topic):
+    t0 = time.perf_counter()
+    # Text fonts are the only per-language difference, so render once with the default font
+    script = generate_final_valid_code(topic, None)
+    t1 = time.perf_counter()
+    video = render_video(script)
+    t2 = time.perf_counter()
+    return {"video_file": video}, {"script_llm": t1 - t0, "render": t2 - t1}
+
+def batch_narration_job(topic, lang_key, out_dir):
+    lang_display, tts_lang, model_lang, _ = LANG_MAP[lang_key]
+    base = os.path.join(out_dir, topic_slug(topic), f"{topic_slug(topic)}_{lang_display}")
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+
+    t0 = time.perf_counter()
+    summary = summarize(topic, model_lang)
+    quiz = create_quiz(topic, model_lang)
+    t1 = time.perf_counter()
+    text_to_speech(summary, base + ".mp3", tts_lang)
+    t2 = time.perf_counter()
+
+    with open(base + "_summary.txt", "w", encoding="utf-8") as f:
+        f.write(summary)
+    with open(base + "_quiz.txt", "w", encoding="utf-8") as f:
+        f.write(quiz)
+    audio_len = get_audio_duration(base + ".mp3")
+    if audio_len <= 0:
+        raise Exception(f"Unreadable narration audio {base}.mp3")
+    result = {
+        "audio_file": base + ".mp3",
+        "summary_file": base + "_summary.txt",
+        "quiz_file": base + "_quiz.txt",
+        "audio_len": audio_len,
+    }
+    return result, {"narration_llm": t1 - t0, "tts": t2 - t1}
+
+def batch_mux_job(video, audio, audio_len, output):
+    t0 = time.perf_counter()
+    stretched = stretch_video_to_audio(video, audio_len, output.replace(".mp4", "_stretched.mp4"))
+    # An unstretched short video would make -shortest cut the narration off
+    if stretched == video and get_video_duration(video) < audio_len:
+        raise Exception(f"ffmpeg stretch failed for {output}")
+    # Mux into a temp file so a crash never leaves a partial final video behind
+    partial = output.replace(".mp4", ".part.mp4")
+    if not merge_audio_video(stretched, audio, partial):
+        raise Exception(f"ffmpeg merge failed for {output}")
+    os.replace(partial, output)
+    return {"video_file": output}, {"ffmpeg": time.perf_counter() - t0}
+
+# ---- Scheduler ----
+
+def run_batch(manifest, out_dir="output", workers=None, ledger_path=None):
+    jobs = load_manifest(manifest)
+    by_slug = {topic_slug(t): t for t in jobs}
+    ledger_path = ledger_path or os.path.join(out_dir, "batch_ledger.jsonl")
+    os.makedirs(out_dir, exist_ok=True)
+    done = {j: r for j, r in load_ledger(ledger_path).items() if outputs_exist(r)}
+
+    stats = {}  # stage -> [jobs, busy seconds]
+    failed = []
+    start = time.perf_counter()
+
+    with open(ledger_path, "a", encoding="utf-8") as ledger, ProcessPoolExecutor(max_workers=workers) as pool:
+        running = {}
+
+        def submit(job, fn, *args):
+            if job in done or job in running.values():
+                return
+            running[pool.submit(fn, *args)] = job
+
+        def schedule_mux(topic, lang_key):
+            slug = topic_slug(topic)
+            video_job, narration_job = f"video:{slug}", f"narration:{slug}:{lang_key}"
+            if video_job in done and narration_job in done:
+                lang_display = LANG_MAP[lang_key][0]
+                narration = done[narration_job]
+                output = os.path.join(out_dir, slug, f"{slug}_{lang_display}_with_audio.mp4")
+                submit(f"final:{slug}:{lang_key}", batch_mux_job,
+                       done[video_job]["video_file"], narration["audio_file"], narration["audio_len"], output)
+
+        for topic, lang_keys in jobs.items():
+            # Upstream work is only needed for videos that aren't finished yet
+            pending = [k for k in lang_keys if f"final:{topic_slug(topic)}:{k}" not in done]
+            if pending:
+                submit(f"video:{topic_slug(topic)}", batch_video_job, topic)
+            for lang_key in pending:
+                submit(f"narration:{topic_slug(topic)}:{lang_key}", batch_narration_job, topic, lang_key, out_dir)
+                schedule_mux(topic, lang_key)
+
+        skipped = sum(1 for t, keys in jobs.items() for k in keys if f"final:{topic_slug(t)}:{k}" in done)
+        print(f"📦 {len(jobs)} topics, {sum(map(len, jobs.values()))} videos ({skipped} already done)")
+
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                job = running.pop(fut)
+                try:
+                    result, timings = fut.result()
+                except Exception as e:
+                    print(f"❌ {job}: {e}")
+                    failed.append(job)
+                    continue
+
+                done[job] = result
+                record_ledger(ledger, job, result)
+                for stage, secs in timings.items():
+                    s = stats.setdefault(stage, [0, 0.0])
+                    s[0] += 1
+                    s[1] += secs
+                print(f"✅ {job}")
+
+                kind, slug = job.split(":")[:2]
+                topic = by_slug[slug]
+                if kind == "video":
+                    for lang_key in jobs[topic]:
+                        schedule_mux(topic, lang_key)
+                elif kind == "narration":
+                    schedule_mux(topic, job.rsplit(":", 1)[1])
+
+    wall = time.perf_counter() - start
+    print(f"\n⏱️  Batch finished in {wall:.1f}s")
+    for stage, (count, busy) in sorted(stats.items()):
+        print(f"  {stage:<13} {count:4d} jobs  {busy / count:7.1f}s avg  {count / wall * 60:7.1f} jobs/min")
+    if failed:
+        print(f"⚠️  {len(failed)} jobs failed (rerun to retry): " + ", ".join(failed))
+    return not failed
+
+
 # ===========================
 # 🚀 ORIGINAL CLI STILL WORKS
 # ===========================
 if __name__ == "__main__":
 
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description="Batch pre-render topics from a manifest.")
+        parser.add_argument("--batch", required=True, metavar="MANIFEST", help="CSV of topic,lang[,lang...] rows")
+        parser.add_argument("--out", default="output", help="output folder (default: output)")
+        parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+        parser.add_argument("--ledger", default=None, help="completion ledger (default: <out>/batch_ledger.jsonl)")
+        args = parser.parse_args()
+        sys.exit(0 if run_batch(args.batch, args.out, args.workers, args.ledger) else 1)
+
     lang_display, tts_lang, model_lang, font = choose_language()
     topic = input("\n🧠 Enter topic: ").strip()
 
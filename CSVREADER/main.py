@@ -7,17 +7,24 @@ CSV LEFT → RIGHT replacer with Language selection + model-friendly flow
     - Return model output (and which CSV replacements were applied to input)
 - If Use Groq == False:
     - Apply LEFT->RIGHT to user input and return it (no model call)
+- `python main.py --serve` runs the production server (needs: pip install waitress)
 """
 
 from flask import Flask, request, jsonify, render_template_string
-import os, re, csv, unicodedata, requests, json
+from contextlib import contextmanager
+import os, re, sys, csv, unicodedata, requests, json, threading
 
 # ---------- CONFIG ----------
 API_KEY = ""
 GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
 CSV_NAME = "Uploaded_CSV_preview.csv"
-PORT = 8000
+HOST = os.environ.get("CSVREADER_HOST", "127.0.0.1")   # --serve only; the debug server stays on loopback
+PORT = int(os.environ.get("CSVREADER_PORT", 8000))
 MODELS_TO_TRY = ["llama-3.1-8b-instant", "llama-3.3-70b-versatile", "llama3-8b-8192"]
+MAX_UPSTREAM_CALLS = int(os.environ.get("MAX_UPSTREAM_CALLS", 4))      # Groq calls in flight at once
+MAX_QUEUED_REQUESTS = int(os.environ.get("MAX_QUEUED_REQUESTS", 16))   # requests allowed to wait for a slot
+QUEUE_TIMEOUT = float(os.environ.get("QUEUE_TIMEOUT", 30))             # seconds a queued request may wait
+RETRY_AFTER = int(os.environ.get("RETRY_AFTER", 5))                    # hint sent with 503 responses
 # ----------------------------
 
 app = Flask(__name__)
@@ -29,6 +36,44 @@ def norm(s):
     s = s.replace("\u200c","").replace("\u200d","").replace("\ufeff","")
     return re.sub(r"\s+"," ", s).strip()
 
+# ---------- UPSTREAM GATE ----------
+class ServerBusy(Exception):
+    pass
+
+class UpstreamGate:
+    """Caps concurrent Groq calls and bounds how many requests may wait for one."""
+    def __init__(self, max_calls, max_queued, timeout):
+        self._calls = threading.BoundedSemaphore(max_calls)
+        self._lock = threading.Lock()
+        self.max_calls = max_calls
+        self.capacity = max_calls + max_queued
+        self.timeout = timeout
+        self.admitted = 0   # waiting for a slot + calling upstream
+        self.active = 0     # calling upstream
+
+    @contextmanager
+    def slot(self):
+        with self._lock:
+            if self.admitted >= self.capacity:
+                raise ServerBusy()
+            self.admitted += 1
+        try:
+            if not self._calls.acquire(timeout=self.timeout):
+                raise ServerBusy()
+            with self._lock:
+                self.active += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self.active -= 1
+                self._calls.release()
+        finally:
+            with self._lock:
+                self.admitted -= 1
+
+gate = UpstreamGate(MAX_UPSTREAM_CALLS, MAX_QUEUED_REQUESTS, QUEUE_TIMEOUT)
+
 # ---------- CSV LOADER ----------
 def load_csv_pairs():
     path = os.path.join(os.path.dirname(__file__), CSV_NAME)
@@ -129,6 +174,24 @@ def ask_groq(text, lang, api_key):
             return None, {"error":"auth","detail": r.text}
     return None, {"error":"no_model"}
 
+# ---------- HEALTH ----------
+@app.errorhandler(ServerBusy)
+def server_busy(e):
+    return jsonify({"error":"busy","retry_after":RETRY_AFTER}), 503, {"Retry-After": str(RETRY_AFTER)}
+
+@app.route("/healthz")
+def healthz():
+    return jsonify({"status":"ok"})
+
+@app.route("/readyz")
+def readyz():
+    ready = gate.admitted < gate.capacity
+    body = jsonify({"ready": ready, "active": gate.active, "queued": gate.admitted - gate.active,
+                    "capacity": gate.capacity})
+    if not ready:
+        return body, 503, {"Retry-After": str(RETRY_AFTER)}
+    return body
+
 # ---------- UI ----------
 @app.route("/")
 def ui():
@@ -195,7 +258,8 @@ def process_endpoint():
         if not api_key:
             return jsonify({"error":"missing_api_key"}), 400
         # call model with the (possibly replaced) prompt_to_model
-        raw, info = ask_groq(prompt_to_model, lang, api_key)
+        with gate.slot():
+            raw, info = ask_groq(prompt_to_model, lang, api_key)
         if raw is None:
             return jsonify({"error":"model_failed","detail":info}), 500
         source_text = raw
@@ -220,6 +284,19 @@ def process_endpoint():
         "source_info": source_info
     })
 
+def serve():
+    """Production mode: multi-threaded waitress server sized to the upstream gate."""
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        sys.exit("--serve needs waitress: pip install waitress")
+    # enough threads for every admitted request plus a few for health checks and the UI
+    waitress_serve(app, host=HOST, port=PORT, threads=gate.capacity + 4)
+
 if __name__=="__main__":
-    print(f"Running → http://127.0.0.1:{PORT} (CSV: {CSV_NAME})")
-    app.run(port=PORT, debug=True)
\ No newline at end of file
+    if "--serve" in sys.argv:
+        print(f"Running → http://{HOST}:{PORT} (CSV: {CSV_NAME})")
+        serve()
+    else:
+        print(f"Running → http://127.0.0.1:{PORT} (CSV: {CSV_NAME})")
+        app.run(host="127.0.0.1", port=PORT, debug=True)
\ No newline at end of file
@@ -1,6 +1,7 @@
 from flask import Flask, render_template, request, redirect, url_for, session
 from openai import OpenAI
-import re
+from contextlib import contextmanager
+import os, re, sys, threading
 
 app = Flask(__name__)
 app.secret_key = "samarth_mcq_secret_2025"  # needed for session storage
@@ -18,6 +19,56 @@ LANG_MAP = {
     "ta": "Tamil"
 }
 
+# ========= 🚦 SERVING CONFIG =========
+# `python app.py --serve` runs the production server and needs: pip install waitress
+HOST = os.environ.get("MCQ_HOST", "127.0.0.1")   # --serve only; the debug server stays on loopback
+PORT = int(os.environ.get("MCQ_PORT", 5000))
+MAX_UPSTREAM_CALLS = int(os.environ.get("MAX_UPSTREAM_CALLS", 4))      # requests talking to the LLM at once
+MAX_QUEUED_REQUESTS = int(os.environ.get("MAX_QUEUED_REQUESTS", 16))   # requests allowed to wait for a slot
+QUEUE_TIMEOUT = float(os.environ.get("QUEUE_TIMEOUT", 30))             # seconds a queued request may wait
+RETRY_AFTER = int(os.environ.get("RETRY_AFTER", 5))                    # hint sent with 503 responses
+
+
+class ServerBusy(Exception):
+    pass
+
+
+class UpstreamGate:
+    """Caps concurrent LLM calls and bounds how many requests may wait for one."""
+
+    def __init__(self, max_calls, max_queued, timeout):
+        self._calls = threading.BoundedSemaphore(max_calls)
+        self._lock = threading.Lock()
+        self.max_calls = max_calls
+        self.capacity = max_calls + max_queued
+        self.timeout = timeout
+        self.admitted = 0   # waiting for a slot + calling upstream
+        self.active = 0     # calling upstream
+
+    @contextmanager
+    def slot(self):
+        with self._lock:
+            if self.admitted >= self.capacity:
+                raise ServerBusy()
+            self.admitted += 1
+        try:
+            if not self._calls.acquire(timeout=self.timeout):
+                raise ServerBusy()
+            with self._lock:
+                self.active += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self.active -= 1
+                self._calls.release()
+        finally:
+            with self._lock:
+                self.admitted -= 1
+
+
+gate = UpstreamGate(MAX_UPSTREAM_CALLS, MAX_QUEUED_REQUESTS, QUEUE_TIMEOUT)
+
 # ========= 🧠 AI HELPERS =========
 
 def generate_summary(topic, lang_code):
@@ -118,6 +169,26 @@ def parse_mcq(text):
 
 # ========= FLASK ROUTES =========
 
+@app.errorhandler(ServerBusy)
+def server_busy(e):
+    return "Server is busy, please try again shortly.", 503, {"Retry-After": str(RETRY_AFTER)}
+
+
+@app.route("/healthz")
+def healthz():
+    return {"status": "ok"}
+
+
+@app.route("/readyz")
+def readyz():
+    ready = gate.admitted < gate.capacity
+    body = {"ready": ready, "active": gate.active, "queued": gate.admitted - gate.active,
+            "capacity": gate.capacity}
+    if not ready:
+        return body, 503, {"Retry-After": str(RETRY_AFTER)}
+    return body
+
+
 @app.route("/")
 def index():
     return render_template("index.html", languages=LANG_MAP)
@@ -131,8 +202,9 @@ def generate():
     if not topic:
         return redirect(url_for("index"))
 
-    summary = generate_summary(topic, lang)
-    quiz_raw = generate_quiz(topic, lang)
+    with gate.slot():
+        summary = generate_summary(topic, lang)
+        quiz_raw = generate_quiz(topic, lang)
     questions = parse_mcq(quiz_raw)
 
     # store in session
@@ -182,5 +254,18 @@ def submit():
                            results=detailed_results)
 
 
+def serve():
+    """Production mode: multi-threaded waitress server sized to the upstream gate."""
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        sys.exit("--serve needs waitress: pip install waitress")
+    # enough threads for every admitted request plus a few for health checks and static files
+    waitress_serve(app, host=HOST, port=PORT, threads=gate.capacity + 4)
+
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    if "--serve" in sys.argv:
+        serve()
+    else:
+        app.run(host="127.0.0.1", port=PORT, debug=True)